@@ -248,15 +248,34 @@ class ThreadedClientTest(unittest.TestCase):
         yield Frame(opcode=OPCODE_CLOSE, body=b'',
                     fin=1).build()
 
+    def _recv_into_from(self, chunks):
+        """ Mimics ``recv_into`` by filling the provided buffer
+        with the bytes yielded by the ``chunks`` generator. """
+        pending = bytearray()
+        def fill(buf, *args):
+            if not pending:
+                try:
+                    pending.extend(next(chunks))
+                except StopIteration:
+                    return 0
+            n = min(len(buf), len(pending))
+            buf[:n] = pending[:n]
+            del pending[:n]
+            return n
+        return fill
+
     def test_thread_is_started_once_connected(self):
-        self.sock.recv.side_effect = self._exchange1()
+        exchange = self._exchange1()
+        # the handshake is read with recv, the run loop with recv_into
+        self.sock.recv.side_effect = exchange
+        self.sock.recv_into.side_effect = self._recv_into_from(exchange)
         self.assertFalse(self.client._th.is_alive())
 
         self.client.connect()
         time.sleep(0.5)
         self.assertTrue(self.client._th.is_alive())
 
-        self.sock.recv.side_effect = self._exchange2()
+        self.sock.recv_into.side_effect = self._recv_into_from(self._exchange2())
         time.sleep(0.5)
         self.assertFalse(self.client._th.is_alive())
 
@@ -266,14 +285,16 @@ class ThreadedClientTest(unittest.TestCase):
         self.sock.pending = lambda: False
         self.client._is_secure = True
 
-        self.sock.recv.side_effect = self._exchange1()
+        exchange = self._exchange1()
+        self.sock.recv.side_effect = exchange
+        self.sock.recv_into.side_effect = self._recv_into_from(exchange)
         self.assertFalse(self.client._th.is_alive())
 
         self.client.connect()
         time.sleep(0.5)
         self.assertTrue(self.client._th.is_alive())
 
-        self.sock.recv.side_effect = self._exchange2()
+        self.sock.recv_into.side_effect = self._recv_into_from(self._exchange2())
         time.sleep(0.5)
         self.assertFalse(self.client._th.is_alive())
 
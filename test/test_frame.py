@@ -103,6 +103,22 @@ class WSFrameBuilderTest(unittest.TestCase):
     def test_passing_unencoded_string_raises_type_error(self):
         self.assertRaises(TypeError, Frame, opcode=OPCODE_TEXT, body=u'\xe9', fin=1)
 
+class WSFrameResetTest(unittest.TestCase):
+    def test_reset_restores_pristine_state(self):
+        f = Frame()
+        f.parser.send(Frame(opcode=OPCODE_TEXT, body=b'hello', fin=1,
+                            masking_key=os.urandom(4)).build())
+        f.reset()
+        self.assertEqual(f.opcode, None)
+        self.assertEqual(f.body, b'')
+        self.assertEqual(f.masking_key, None)
+        self.assertEqual(f.fin, 0)
+        self.assertEqual(f.payload_length, 0)
+
+        # the frame can parse again from scratch
+        f.parser.send(Frame(opcode=OPCODE_TEXT, body=b'world', fin=1).build())
+        self.assertEqual(f.body, b'world')
+
 class WSFrameParserTest(unittest.TestCase):
     def test_frame_parser_is_a_generator(self):
         f = Frame()
@@ -11,7 +11,7 @@ except ImportError:
 from mock import MagicMock, call, patch
 
 from ws4py.manager import WebSocketManager, SelectPoller,\
-     EPollPoller
+     EPollPoller, SelectorsPoller
 from ws4py.websocket import WebSocket
 
 class WSManagerTest(unittest.TestCase):
@@ -277,6 +277,57 @@ class WSEPollPollerTest(unittest.TestCase):
         except Exception as ex:
             self.fail("Shouldn't have failed: %s" % ex)
             
+class WSSelectorsPollerTest(unittest.TestCase):
+    def test_poll_returns_ready_fd(self):
+        import socket
+        a, b = socket.socketpair()
+        try:
+            poller = SelectorsPoller(timeout=0.1)
+            poller.register(a.fileno())
+            b.send(b'x')
+            fd = poller.poll()
+            self.assertEqual(fd, [a.fileno()])
+
+            poller.unregister(a.fileno())
+            fd = poller.poll()
+            self.assertEqual(fd, [])
+
+            poller.release()
+        finally:
+            a.close()
+            b.close()
+
+    def test_register_twice_does_not_duplicate_fd(self):
+        import socket
+        a, b = socket.socketpair()
+        try:
+            poller = SelectorsPoller(timeout=0.1)
+            poller.register(a.fileno())
+            poller.register(a.fileno())
+            b.send(b'x')
+            fd = poller.poll()
+            self.assertEqual(fd, [a.fileno()])
+            poller.release()
+        finally:
+            a.close()
+            b.close()
+
+    def test_unregister_twice_has_no_side_effect(self):
+        import socket
+        a, b = socket.socketpair()
+        try:
+            poller = SelectorsPoller()
+            poller.register(a.fileno())
+            poller.unregister(a.fileno())
+            try:
+                poller.unregister(a.fileno())
+            except Exception as ex:
+                self.fail("Shouldn't have failed: %s" % ex)
+            poller.release()
+        finally:
+            a.close()
+            b.close()
+
 if __name__ == '__main__':
     suite = unittest.TestSuite()
     loader = unittest.TestLoader()
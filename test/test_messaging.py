@@ -87,6 +87,17 @@ class WSMessagingTest(unittest.TestCase):
         m.extend(u' oui')
         self.assertEqual(m.data, u'\xe9trange oui'.encode('utf-8'))
 
+    def test_memoryview_text_message(self):
+        m = TextMessage(memoryview(u'\xe9trange'.encode('utf-8')))
+        self.assertEqual(m.opcode, OPCODE_TEXT)
+        self.assertIsInstance(m.data, bytes)
+        # the actual bytes, not the view's repr as bytes(view)
+        # would give on py2
+        self.assertEqual(m.data, u'\xe9trange'.encode('utf-8'))
+
+        m.extend(memoryview(b' oui'))
+        self.assertEqual(m.data, u'\xe9trange oui'.encode('utf-8'))
+
     def test_unicode_text_message_with_no_encoding(self):
         self.assertRaises(TypeError, Message, OPCODE_TEXT, u'\xe9trange', encoding=None)
 
@@ -25,18 +25,18 @@ class WSStreamTest(unittest.TestCase):
         s = Stream(expect_masking=True)
         s.parser.send(f)
         next(s.parser)
-        self.assertNotEqual(s.errors, [])
-        self.assertIsInstance(s.errors[0], CloseControlMessage)
-        self.assertEqual(s.errors[0].code, 1002)
+        self.assertIsNotNone(s.error)
+        self.assertIsInstance(s.error, CloseControlMessage)
+        self.assertEqual(s.error.code, 1002)
 
     def test_using_masking_key_when_unexpected(self):
         f = Frame(opcode=OPCODE_TEXT, body=b'hello', fin=1, masking_key=os.urandom(4)).build()
         s = Stream(expect_masking=False)
         s.parser.send(f)
         next(s.parser)
-        self.assertNotEqual(s.errors, [])
-        self.assertIsInstance(s.errors[0], CloseControlMessage)
-        self.assertEqual(s.errors[0].code, 1002)
+        self.assertIsNotNone(s.error)
+        self.assertIsInstance(s.error, CloseControlMessage)
+        self.assertEqual(s.error.code, 1002)
 
     def test_text_messages_cannot_interleave(self):
         s = Stream()
@@ -51,9 +51,9 @@ class WSStreamTest(unittest.TestCase):
         s.parser.send(f)
         next(s.parser)
 
-        self.assertNotEqual(s.errors, [])
-        self.assertIsInstance(s.errors[0], CloseControlMessage)
-        self.assertEqual(s.errors[0].code, 1002)
+        self.assertIsNotNone(s.error)
+        self.assertIsInstance(s.error, CloseControlMessage)
+        self.assertEqual(s.error.code, 1002)
 
     def test_binary_messages_cannot_interleave(self):
         s = Stream()
@@ -68,9 +68,9 @@ class WSStreamTest(unittest.TestCase):
         s.parser.send(f)
         next(s.parser)
 
-        self.assertNotEqual(s.errors, [])
-        self.assertIsInstance(s.errors[0], CloseControlMessage)
-        self.assertEqual(s.errors[0].code, 1002)
+        self.assertIsNotNone(s.error)
+        self.assertIsInstance(s.error, CloseControlMessage)
+        self.assertEqual(s.error.code, 1002)
 
     def test_binary_and_text_messages_cannot_interleave(self):
         s = Stream()
@@ -85,9 +85,9 @@ class WSStreamTest(unittest.TestCase):
         s.parser.send(f)
         next(s.parser)
 
-        self.assertNotEqual(s.errors, [])
-        self.assertIsInstance(s.errors[0], CloseControlMessage)
-        self.assertEqual(s.errors[0].code, 1002)
+        self.assertIsNotNone(s.error)
+        self.assertIsInstance(s.error, CloseControlMessage)
+        self.assertEqual(s.error.code, 1002)
 
     def test_continuation_frame_before_message_started_is_invalid(self):
         f = Frame(opcode=OPCODE_CONTINUATION, body=b'hello',
@@ -95,9 +95,9 @@ class WSStreamTest(unittest.TestCase):
         s = Stream()
         s.parser.send(f)
         next(s.parser)
-        self.assertNotEqual(s.errors, [])
-        self.assertIsInstance(s.errors[0], CloseControlMessage)
-        self.assertEqual(s.errors[0].code, 1002)
+        self.assertIsNotNone(s.error)
+        self.assertIsInstance(s.error, CloseControlMessage)
+        self.assertEqual(s.error.code, 1002)
 
     def test_invalid_encoded_bytes(self):
         f = Frame(opcode=OPCODE_TEXT, body=b'h\xc3llo',
@@ -105,9 +105,9 @@ class WSStreamTest(unittest.TestCase):
         s = Stream()
         s.parser.send(f)
         next(s.parser)
-        self.assertNotEqual(s.errors, [])
-        self.assertIsInstance(s.errors[0], CloseControlMessage)
-        self.assertEqual(s.errors[0].code, 1007)
+        self.assertIsNotNone(s.error)
+        self.assertIsInstance(s.error, CloseControlMessage)
+        self.assertEqual(s.error.code, 1007)
 
     def test_invalid_encoded_bytes_on_continuation(self):
         s = Stream()
@@ -122,30 +122,30 @@ class WSStreamTest(unittest.TestCase):
         s.parser.send(f)
         next(s.parser)
 
-        self.assertNotEqual(s.errors, [])
-        self.assertIsInstance(s.errors[0], CloseControlMessage)
-        self.assertEqual(s.errors[0].code, 1007)
+        self.assertIsNotNone(s.error)
+        self.assertIsInstance(s.error, CloseControlMessage)
+        self.assertEqual(s.error.code, 1007)
 
     def test_too_large_close_message(self):
         payload = struct.pack("!H", 1000) + b'*' * 330
         f = Frame(opcode=OPCODE_CLOSE, body=payload,
                   fin=1, masking_key=os.urandom(4)).build()
         s = Stream()
-        self.assertEqual(len(s.errors), 0)
+        self.assertIsNone(s.error)
         self.assertEqual(s.closing, None)
         s.parser.send(f)
         self.assertEqual(s.closing, None)
 
-        self.assertEqual(len(s.errors), 1)
-        self.assertEqual(type(s.errors[0]), CloseControlMessage)
-        self.assertEqual(s.errors[0].code, 1002)
+        self.assertIsNotNone(s.error)
+        self.assertEqual(type(s.error), CloseControlMessage)
+        self.assertEqual(s.error.code, 1002)
 
     def test_invalid_sized_close_message(self):
         payload = b'boom'
         f = Frame(opcode=OPCODE_CLOSE, body=payload,
                   fin=1, masking_key=os.urandom(4)).build()
         s = Stream()
-        self.assertEqual(len(s.errors), 0)
+        self.assertIsNone(s.error)
         self.assertEqual(s.closing, None)
         s.parser.send(f)
         self.assertEqual(type(s.closing), CloseControlMessage)
@@ -156,7 +156,7 @@ class WSStreamTest(unittest.TestCase):
         f = Frame(opcode=OPCODE_CLOSE, body=payload,
                   fin=1, masking_key=os.urandom(4)).build()
         s = Stream()
-        self.assertEqual(len(s.errors), 0)
+        self.assertIsNone(s.error)
         self.assertEqual(s.closing, None)
         s.parser.send(f)
         self.assertEqual(type(s.closing), CloseControlMessage)
@@ -167,7 +167,7 @@ class WSStreamTest(unittest.TestCase):
         f = Frame(opcode=OPCODE_CLOSE, body=payload,
                   fin=1, masking_key=os.urandom(4)).build()
         s = Stream()
-        self.assertEqual(len(s.errors), 0)
+        self.assertIsNone(s.error)
         self.assertEqual(s.closing, None)
         s.parser.send(f)
         self.assertEqual(type(s.closing), CloseControlMessage)
@@ -178,12 +178,12 @@ class WSStreamTest(unittest.TestCase):
         f = Frame(opcode=OPCODE_CLOSE, body=payload,
                   fin=1, masking_key=os.urandom(4)).build()
         s = Stream()
-        self.assertEqual(len(s.errors), 0)
+        self.assertIsNone(s.error)
         self.assertEqual(s.closing, None)
         s.parser.send(f)
         self.assertEqual(s.closing, None)
-        self.assertEqual(type(s.errors[0]), CloseControlMessage)
-        self.assertEqual(s.errors[0].code, 1007)
+        self.assertEqual(type(s.error), CloseControlMessage)
+        self.assertEqual(s.error.code, 1007)
 
     def test_protocol_exception_from_frame_parsing(self):
         payload = struct.pack("!H", 1000) + b'hello'
@@ -192,12 +192,12 @@ class WSStreamTest(unittest.TestCase):
         f.rsv1 = 1
         f = f.build()
         s = Stream()
-        self.assertEqual(len(s.errors), 0)
+        self.assertIsNone(s.error)
         self.assertEqual(s.closing, None)
         s.parser.send(f)
         self.assertEqual(s.closing, None)
-        self.assertEqual(type(s.errors[0]), CloseControlMessage)
-        self.assertEqual(s.errors[0].code, 1002)
+        self.assertEqual(type(s.error), CloseControlMessage)
+        self.assertEqual(s.error.code, 1002)
 
     def test_close_message_received(self):
         payload = struct.pack("!H", 1000) + b'hello'
@@ -214,17 +214,19 @@ class WSStreamTest(unittest.TestCase):
         msg = b'ping me'
         f = Frame(opcode=OPCODE_PING, body=msg, fin=1, masking_key=os.urandom(4)).build()
         s = Stream()
-        self.assertEqual(len(s.pings), 0)
+        self.assertIsNone(s.ping_message)
         s.parser.send(f)
-        self.assertEqual(len(s.pings), 1)
+        self.assertIsNotNone(s.ping_message)
+        self.assertEqual(s.ping_message.data, msg)
 
     def test_pong_message_received(self):
         msg = b'pong!'
         f = Frame(opcode=OPCODE_PONG, body=msg, fin=1, masking_key=os.urandom(4)).build()
         s = Stream()
-        self.assertEqual(len(s.pongs), 0)
+        self.assertIsNone(s.pong_message)
         s.parser.send(f)
-        self.assertEqual(len(s.pongs), 1)
+        self.assertIsNotNone(s.pong_message)
+        self.assertEqual(s.pong_message.data, msg)
 
     def test_text_message_received(self):
         msg = b'hello there'
@@ -290,9 +292,11 @@ class WSStreamTest(unittest.TestCase):
             self.assertEqual(s.message.opcode, OPCODE_TEXT)
 
             f = Frame(opcode=OPCODE_PING, body=b'ping me', fin=1, masking_key=os.urandom(4)).build()
-            self.assertEqual(len(s.pings), i)
+            self.assertIsNone(s.ping_message)
             s.parser.send(f)
-            self.assertEqual(len(s.pings), i+1)
+            self.assertIsNotNone(s.ping_message)
+            # release the slot as the stream owner would after replying
+            s.ping_message = None
 
         f = Frame(opcode=OPCODE_CONTINUATION, body=msg, fin=1, masking_key=os.urandom(4)).build()
         s.parser.send(f)
@@ -381,6 +385,20 @@ class WSStreamTest(unittest.TestCase):
         self.assertIsInstance(m, bytes)
         self.assertEqual(len(m), 9)
 
+    def test_common_close_messages_are_shared(self):
+        s = Stream()
+        self.assertIs(s.close(), s.close())
+        self.assertIs(s.close(code=1001), Stream().close(code=1001))
+        self.assertIsNot(s.close(reason='boom'), s.close(reason='boom'))
+        self.assertIsNot(s.close(code=3001), s.close(code=3001))
+
+    def test_empty_unmasked_pong_is_cached(self):
+        self.assertIs(Stream().pong(), Stream().pong())
+        self.assertIs(Stream().ping(), Stream().ping())
+        # masked frames need a fresh random key every time
+        self.assertIsNot(Stream(always_mask=True).pong(),
+                         Stream(always_mask=True).pong())
+
     def test_helper_pong_message(self):
         s = Stream()
         m = s.pong('sos')
@@ -393,6 +411,42 @@ class WSStreamTest(unittest.TestCase):
         self.assertIsInstance(m, bytes)
         self.assertEqual(len(m), 9)
 
+    def test_buffer_released_after_large_message(self):
+        import sys
+        body = b'*' * (512 * 1024)
+        f = Frame(opcode=OPCODE_BINARY, body=body,
+                  fin=1, masking_key=os.urandom(4)).build()
+        s = Stream()
+        s.feed(f)
+        self.assertEqual(s.has_message, True)
+        self.assertEqual(s.buffered, 0)
+        self.assertLessEqual(sys.getsizeof(s._buffer), s.max_buffer_size)
+
+    def test_max_frame_size_rejects_oversized_frames(self):
+        f = Frame(opcode=OPCODE_BINARY, body=os.urandom(126),
+                  fin=1, masking_key=os.urandom(4)).build()
+        s = Stream(max_frame_size=125)
+        s.feed(f)
+        self.assertIsNotNone(s.error)
+        self.assertEqual(s.error.code, 1009)
+
+        f = Frame(opcode=OPCODE_BINARY, body=os.urandom(2048),
+                  fin=1, masking_key=os.urandom(4)).build()
+        s = Stream(max_frame_size=1024)
+        s.feed(f)
+        self.assertIsNotNone(s.error)
+        self.assertEqual(s.error.code, 1009)
+
+    def test_max_frame_size_accepts_smaller_frames(self):
+        msg = os.urandom(512)
+        f = Frame(opcode=OPCODE_BINARY, body=msg,
+                  fin=1, masking_key=os.urandom(4)).build()
+        s = Stream(max_frame_size=1024)
+        s.feed(f)
+        self.assertIsNone(s.error)
+        self.assertTrue(s.has_message)
+        self.assertEqual(s.message.data, msg)
+
     def test_closing_parser_should_release_resources(self):
         f = Frame(opcode=OPCODE_TEXT, body=b'hello',
                   fin=1, masking_key=os.urandom(4)).build()
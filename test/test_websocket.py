@@ -31,6 +31,13 @@ class WSWebSocketTest(unittest.TestCase):
         self.assertEqual(ws.local_address, ('127.0.0.1', 52300))
         self.assertEqual(ws.peer_address, ('127.0.0.1', 4800))
 
+    def test_socket_options_are_applied(self):
+        m = MagicMock()
+        ws = WebSocket(sock=m,
+                       socket_options=[(socket.SOL_SOCKET, socket.SO_RCVBUF, 262144)])
+        m.setsockopt.assert_any_call(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        m.setsockopt.assert_any_call(socket.SOL_SOCKET, socket.SO_RCVBUF, 262144)
+
     def test_get_underlying_connection(self):
         m = MagicMock()
         ws = WebSocket(sock=m)
@@ -97,14 +104,16 @@ class WSWebSocketTest(unittest.TestCase):
         self.assertFalse(ws.once())
 
     def test_socket_error_on_receiving_more_bytes(self):
-        m = MagicMock()
-        m.recv = MagicMock(side_effect=socket.error)
+        # spec the mock so hasattr(sock, '_ssl') is False and the
+        # error genuinely comes out of recv_into, not the SSL path
+        m = MagicMock(spec=socket.socket)
+        m.recv_into.side_effect = socket.error
         ws = WebSocket(sock=m)
         self.assertFalse(ws.once())
-        
+
     def test_no_bytes_were_read(self):
         m = MagicMock(spec=socket.socket)
-        m.recv.return_value = b''
+        m.recv_into.return_value = 0
         ws = WebSocket(sock=m)
         self.assertFalse(ws.once())
 
@@ -128,6 +137,14 @@ class WSWebSocketTest(unittest.TestCase):
         ws.send(b'hello world')
         m.sendall.assert_called_once_with(tm)
         
+    def test_send_memoryview_without_masking(self):
+        tm = TextMessage(b'hello world').single()
+
+        m = MagicMock()
+        ws = WebSocket(sock=m)
+        ws.send(memoryview(b'hello world'))
+        m.sendall.assert_called_once_with(tm)
+
     def test_send_message_without_masking(self):
         tm = TextMessage(b'hello world')
         
@@ -152,6 +169,20 @@ class WSWebSocketTest(unittest.TestCase):
         self.assertEqual(m.sendall.call_count, 2)
         self.assertRaises(StopIteration, next, gen)
         
+    def test_send_iterator_without_masking(self):
+        from ws4py.streaming import Stream
+
+        m = MagicMock()
+        ws = WebSocket(sock=m)
+        ws.send(iter([b'hello', b' ', b'world']))
+        self.assertEqual(m.sendall.call_count, 3)
+
+        # the fragments must reassemble into the original text
+        s = Stream(expect_masking=False)
+        s.feed(b''.join(c[0][0] for c in m.sendall.call_args_list))
+        self.assertTrue(s.has_message)
+        self.assertEqual(s.message.data, b'hello world')
+
     def test_sending_unknown_datetype(self):
         m = MagicMock()
         ws = WebSocket(sock=m)
@@ -169,6 +200,57 @@ class WSWebSocketTest(unittest.TestCase):
             ws.process(b'unused for this test')
             c.assert_called_once_with(1000, b'test closing')
             
+    def test_multiple_pings_answered_with_a_single_write(self):
+        pings = b''.join(Frame(opcode=OPCODE_PING, body=('ping-%d' % i).encode(),
+                               fin=1, masking_key=os.urandom(4)).build()
+                         for i in range(3))
+
+        m = MagicMock()
+        ws = WebSocket(sock=m)
+        self.assertTrue(ws.process(pings))
+
+        # every pong left in one write, payloads echoed verbatim
+        self.assertEqual(m.sendall.call_count, 1)
+
+        from ws4py.streaming import Stream
+        s = Stream(expect_masking=False)
+        s.feed(m.sendall.call_args[0][0])
+        datas = []
+        while s.pong_message is not None:
+            datas.append(s.pong_message.data)
+            s.pong_message = None
+            s.feed(b'')
+        self.assertEqual(datas, [b'ping-0', b'ping-1', b'ping-2'])
+
+    def test_echo_reuses_inbound_payload(self):
+        from ws4py.websocket import EchoWebSocket
+        from ws4py.streaming import Stream
+
+        f = Frame(opcode=OPCODE_TEXT, body=b'hello there',
+                  fin=1, masking_key=os.urandom(4)).build()
+
+        m = MagicMock()
+        ws = EchoWebSocket(sock=m)
+        self.assertTrue(ws.process(f))
+
+        # the echoed frame must parse back to the same text message
+        s = Stream(expect_masking=False)
+        s.feed(m.sendall.call_args[0][0])
+        self.assertTrue(s.has_message)
+        self.assertFalse(s.message.is_binary)
+        self.assertEqual(s.message.data, b'hello there')
+
+    def test_peer_disconnect_is_not_logged_as_error(self):
+        import errno
+        m = MagicMock()
+        ws = WebSocket(sock=m)
+        err = socket.error(errno.ECONNRESET, 'Connection reset by peer')
+        with patch('ws4py.websocket.logger') as log:
+            ws.unhandled_error(err)
+            self.assertEqual(log.debug.call_count, 1)
+            self.assertEqual(log.error.call_count, 0)
+            self.assertEqual(log.exception.call_count, 0)
+
     def test_sending_ping(self):
         tm = PingControlMessage("hello").single(mask=False)
         
@@ -1,9 +1,17 @@
 # -*- coding: utf-8 -*-
-from struct import pack, unpack
+from struct import Struct
 
 from ws4py.exc import FrameTooLargeException, ProtocolException
 from ws4py.compat import py3k, ord, range
 
+# Pre-compiled header (un)packers so that the per-frame hot
+# path never re-parses a format string.
+_PACK_U8 = Struct('!B').pack
+_PACK_U16 = Struct('!H').pack
+_PACK_U64 = Struct('!Q').pack
+_UNPACK_U16 = Struct('!H').unpack
+_UNPACK_U64 = Struct('!Q').unpack
+
 # Frame opcodes defined in the spec.
 OPCODE_CONTINUATION = 0x0
 OPCODE_TEXT = 0x1
@@ -12,7 +20,29 @@ OPCODE_CLOSE = 0x8
 OPCODE_PING = 0x9
 OPCODE_PONG = 0xa
 
-__all__ = ['Frame']
+__all__ = ['Frame', 'build_header']
+
+def build_header(opcode, length, fin=1, masked=False):
+    """
+    Builds the 2 to 10 bytes header of a frame carrying
+    ``length`` bytes of payload with the given ``opcode``.
+
+    Useful to emit a frame around an existing payload
+    without going through a :class:`Frame` instance.
+    """
+    header = _PACK_U8(((fin << 7) | opcode))
+
+    mask_bit = 1 << 7 if masked else 0
+    if length < 126:
+        header += _PACK_U8((mask_bit | length))
+    elif length < (1 << 16):
+        header += _PACK_U8((mask_bit | 126)) + _PACK_U16(length)
+    elif length < (1 << 63):
+        header += _PACK_U8((mask_bit | 127)) + _PACK_U64(length)
+    else:
+        raise FrameTooLargeException()
+
+    return header
 
 class Frame(object):
     def __init__(self, opcode=None, body=b'', masking_key=None, fin=0, rsv1=0, rsv2=0, rsv3=0):
@@ -62,6 +92,22 @@ class Frame(object):
             self._parser.close()
             self._parser = None
 
+    def reset(self):
+        """
+        Resets the frame to its post-construction state
+        so that the instance may be reused to parse or
+        build another frame.
+        """
+        self.opcode = None
+        self.body = b''
+        self.masking_key = None
+        self.fin = 0
+        self.rsv1 = 0
+        self.rsv2 = 0
+        self.rsv3 = 0
+        self.payload_length = 0
+        self._cleanup()
+
     def build(self):
         """
         Builds a frame from the instance's attributes and returns
@@ -81,7 +127,7 @@ class Frame(object):
         ## |N|V|V|V|       |
         ## | |1|2|3|       |
         ## +-+-+-+-+-------+
-        header = pack('!B', ((self.fin << 7)
+        header = _PACK_U8(((self.fin << 7)
                              | (self.rsv1 << 6)
                              | (self.rsv2 << 5)
                              | (self.rsv3 << 4)
@@ -100,11 +146,11 @@ class Frame(object):
 
         length = self.payload_length
         if length < 126:
-            header += pack('!B', (mask_bit | length))
+            header += _PACK_U8((mask_bit | length))
         elif length < (1 << 16):
-            header += pack('!B', (mask_bit | 126)) + pack('!H', length)
+            header += _PACK_U8((mask_bit | 126)) + _PACK_U16(length)
         elif length < (1 << 63):
-            header += pack('!B', (mask_bit | 127)) + pack('!Q', length)
+            header += _PACK_U8((mask_bit | 127)) + _PACK_U64(length)
         else:
             raise FrameTooLargeException()
         
@@ -197,8 +243,7 @@ class Frame(object):
                 some_bytes = buf[:8]
                 buf = buf[8:]
             extended_payload_length = some_bytes
-            self.payload_length = unpack(
-                '!Q', extended_payload_length)[0]
+            self.payload_length = _UNPACK_U64(extended_payload_length)[0]
             if self.payload_length > 0x7FFFFFFFFFFFFFFF:
                 raise FrameTooLargeException()
         elif self.payload_length == 126:
@@ -217,8 +262,7 @@ class Frame(object):
                 some_bytes = buf[:2]
                 buf = buf[2:]
             extended_payload_length = some_bytes
-            self.payload_length = unpack(
-                '!H', extended_payload_length)[0]
+            self.payload_length = _UNPACK_U16(extended_payload_length)[0]
 
         if mask:
             if len(buf) < 4:
@@ -263,10 +307,22 @@ class Frame(object):
            j                   = i MOD 4
            transformed-octet-i = original-octet-i XOR masking-key-octet-j
 
+        On Python 3 the whole payload is XORed at once through an
+        arbitrary precision integer built by repeating the 4-byte
+        key, processing many bytes per interpreter step instead
+        of looping over them one at a time.
         """
+        if py3k:
+            datalen = len(data)
+            if not datalen:
+                return b''
+            key = bytes(self.masking_key[:4])
+            mask = int.from_bytes(key * (datalen >> 2) + key[:datalen & 3], 'big')
+            masked = int.from_bytes(data, 'big') ^ mask
+            return masked.to_bytes(datalen, 'big')
+
         masked = bytearray(data)
-        if py3k: key = self.masking_key
-        else: key = map(ord, self.masking_key)
+        key = map(ord, self.masking_key)
         for i in range(len(data)):
             masked[i] = masked[i] ^ key[i%4]
         return masked
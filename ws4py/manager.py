@@ -46,6 +46,11 @@ import select
 import threading
 import time
 
+try:
+    import selectors
+except ImportError:
+    selectors = None
+
 from ws4py import format_addresses
 from ws4py.compat import py3k
 
@@ -193,6 +198,58 @@ class KQueuePoller(object):
             if event | select.EPOLLIN | select.EPOLLPRI:
                 yield fd
 
+class SelectorsPoller(object):
+    def __init__(self, timeout=0.1):
+        """
+        A poller backed by the :mod:`selectors` module which
+        transparently picks the most efficient implementation
+        offered by the platform (epoll, kqueue, poll or select).
+
+        A single selector instance watches every managed socket
+        so that one thread may dispatch all of them.
+        """
+        self.selector = selectors.DefaultSelector()
+        self.timeout = timeout
+
+    def release(self):
+        """
+        Cleanup resources.
+        """
+        self.selector.close()
+
+    def register(self, fd):
+        """
+        Register a new file descriptor to be
+        part of the selector polling next time around.
+        """
+        try:
+            self.selector.register(fd, selectors.EVENT_READ)
+        except (KeyError, ValueError):
+            pass
+
+    def unregister(self, fd):
+        """
+        Unregister the given file descriptor.
+        """
+        try:
+            self.selector.unregister(fd)
+        except KeyError:
+            pass
+
+    def poll(self):
+        """
+        Polls once and returns a list of
+        ready-to-be-read file descriptors.
+        """
+        if not self.selector.get_map():
+            time.sleep(self.timeout)
+            return []
+        try:
+            events = self.selector.select(timeout=self.timeout)
+        except (IOError, OSError):
+            return []
+        return [key.fd for key, event in events]
+
 class WebSocketManager(threading.Thread):
     def __init__(self, poller=None):
         """
@@ -204,8 +261,9 @@ class WebSocketManager(threading.Thread):
         be the blocking mainloop of your application.
 
         The poller's implementation is automatically chosen
-        with ``epoll`` if available else ``select`` unless you
-        provide your own ``poller``.
+        with the ``selectors`` module when available, falling
+        back to ``epoll`` then ``select``, unless you provide
+        your own ``poller``.
         """
         threading.Thread.__init__(self)
         self.name = "WebSocketManager"
@@ -216,7 +274,10 @@ class WebSocketManager(threading.Thread):
         if poller:
             self.poller = poller
         else:
-            if hasattr(select, "epoll"):
+            if selectors is not None:
+                self.poller = SelectorsPoller()
+                logger.info("Using selectors.DefaultSelector")
+            elif hasattr(select, "epoll"):
                 self.poller = EPollPoller()
                 logger.info("Using epoll")
             else:
@@ -250,7 +311,10 @@ class WebSocketManager(threading.Thread):
         if websocket in self:
             return
 
-        logger.info("Managing websocket %s" % format_addresses(websocket))
+        # format_addresses performs socket calls; don't pay
+        # for them when nobody listens
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Managing websocket %s", format_addresses(websocket))
         websocket.opened()
         with self.lock:
             fd = websocket.sock.fileno()
@@ -268,7 +332,8 @@ class WebSocketManager(threading.Thread):
         if websocket not in self:
             return
 
-        logger.info("Removing websocket %s" % format_addresses(websocket))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Removing websocket %s", format_addresses(websocket))
         with self.lock:
             fd = websocket.sock.fileno()
             self.websockets.pop(fd, None)
@@ -329,7 +394,8 @@ class WebSocketManager(threading.Thread):
                             self.poller.unregister(fd)
 
                         if not ws.terminated:
-                            logger.info("Terminating websocket %s" % format_addresses(ws))
+                            if logger.isEnabledFor(logging.INFO):
+                                logger.info("Terminating websocket %s", format_addresses(ws))
                             ws.terminate()
 
 
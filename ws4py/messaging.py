@@ -6,6 +6,8 @@ from ws4py.framing import Frame, OPCODE_CONTINUATION, OPCODE_TEXT, \
      OPCODE_BINARY, OPCODE_CLOSE, OPCODE_PING, OPCODE_PONG
 from ws4py.compat import unicode, py3k
 
+_PACK_CLOSE_CODE = struct.Struct("!H").pack
+
 __all__ = ['Message', 'TextMessage', 'BinaryMessage', 'CloseControlMessage',
            'PingControlMessage', 'PongControlMessage']
 
@@ -38,6 +40,9 @@ class Message(object):
             data = data.encode(encoding)
         elif isinstance(data, bytearray):
             data = bytes(data)
+        elif isinstance(data, memoryview):
+            # bytes(memoryview) returns the repr on py2
+            data = data.tobytes()
         elif not isinstance(data, bytes):
             raise TypeError("%s is not a supported data type" % type(data))
 
@@ -95,6 +100,8 @@ class Message(object):
             self.data += data
         elif isinstance(data, bytearray):
             self.data += bytes(data)
+        elif isinstance(data, memoryview):
+            self.data += data.tobytes()
         elif isinstance(data, unicode):
             self.data += data.encode(self.encoding)
         else:
@@ -142,7 +149,7 @@ class CloseControlMessage(Message):
     def __init__(self, code=1000, reason=''):
         data = b""
         if code:
-            data += struct.pack("!H", code)
+            data += _PACK_CLOSE_CODE(code)
         if reason is not None:
             if isinstance(reason, unicode):
                 reason = reason.encode('utf-8')
@@ -1,36 +1,93 @@
 # -*- coding: utf-8 -*-
 import struct
-from struct import unpack
+import sys
+from collections import deque
 
 from ws4py.utf8validator import Utf8Validator
 from ws4py.messaging import TextMessage, BinaryMessage, CloseControlMessage,\
      PingControlMessage, PongControlMessage
 from ws4py.framing import Frame, OPCODE_CONTINUATION, OPCODE_TEXT, \
      OPCODE_BINARY, OPCODE_CLOSE, OPCODE_PING, OPCODE_PONG
-from ws4py.exc import FrameTooLargeException, ProtocolException, InvalidBytesError,\
-     TextFrameEncodingException, UnsupportedFrameTypeException, StreamClosed
 from ws4py.compat import py3k
 
 VALID_CLOSING_CODES = [1000, 1001, 1002, 1003, 1007, 1008, 1009, 1010, 1011]
 
+# Pre-compiled extended-length unpackers; unpack_from also reads
+# straight out of the accumulator without slicing it first.
+_UNPACK_U16 = struct.Struct('!H').unpack
+_UNPACK_U16_FROM = struct.Struct('!H').unpack_from
+_UNPACK_U64_FROM = struct.Struct('!Q').unpack_from
+
+DEFAULT_MAX_BUFFER_SIZE = 128 * 1024
+
+# States of the frame parser driven by :meth:`Stream.feed`.
+READ_HEADER = 0
+READ_LEN16 = 1
+READ_LEN64 = 2
+READ_MASK = 3
+READ_BODY = 4
+
+_FRAME_POOL_SIZE = 128
+_frame_pool = deque()
+"""
+Pool of :class:`ws4py.framing.Frame` instances reused across
+parsed frames so that steady-state traffic does not allocate
+a fresh frame object per frame.
+"""
+
+def _pooled_frame():
+    """
+    Returns a pristine frame, reusing a pooled instance
+    whenever one is available.
+    """
+    if _frame_pool:
+        frame = _frame_pool.pop()
+        frame.reset()
+        return frame
+    return Frame()
+
+def _recycle_frame(frame):
+    """
+    Hands ``frame`` back to the pool once the parser is
+    done with it. The pool is bounded so that a spike of
+    traffic does not keep frames alive forever.
+    """
+    frame.reset()
+    if len(_frame_pool) < _FRAME_POOL_SIZE:
+        _frame_pool.append(frame)
+
+_common_close_messages = dict(
+    (code, CloseControlMessage(code=code))
+    for code in (1000, 1001, 1002, 1003, 1006, 1007, 1008)
+)
+"""
+Pre-built close control messages for the usual status codes
+carrying no reason, shared across streams so that closing a
+connection doesn't construct a fresh message.
+"""
+
+_EMPTY_PING = PingControlMessage('').single()
+_EMPTY_PONG = PongControlMessage('').single()
+
 class Stream(object):
-    def __init__(self, always_mask=False, expect_masking=True):
+    def __init__(self, always_mask=False, expect_masking=True,
+                 max_frame_size=None):
         """ Represents a websocket stream of bytes flowing in and out.
 
         The stream doesn't know about the data provider itself and
         doesn't even know about sockets. Instead the stream simply
-        yields for more bytes whenever it requires them. The stream owner
-        is responsible to provide the stream with those bytes until
-        a frame can be interpreted.
+        tells its owner how many more bytes it requires whenever it
+        is fed. The stream owner is responsible to provide the stream
+        with those bytes until a frame can be interpreted.
 
         .. code-block:: python
            :linenos:
 
            >>> s = Stream()
-           >>> s.parser.send(BYTES)
+           >>> s.feed(BYTES)
            >>> s.has_messages
            False
-           >>> s.parser.send(MORE_BYTES)
+           >>> s.feed(MORE_BYTES)
            >>> s.has_messages
            True
            >>> s.message
@@ -40,6 +97,14 @@ class Stream(object):
 
         Set ``expect_masking`` to indicate masking will be
         checked on all parsed frames.
+
+        Set ``max_frame_size`` to the largest frame payload, in
+        bytes, this stream is willing to parse. Larger frames are
+        rejected with a 1009 close message before their payload
+        is buffered. When the limit fits in the 7-bit length
+        field (125 or less), the extended-length states are
+        skipped entirely, shortening the per-frame dispatch for
+        workloads made of small frames.
         """
 
         self.message = None
@@ -49,15 +114,15 @@ class Stream(object):
         are appended to the most recent message.
         """
 
-        self.pings = []
+        self.ping_message = None
         """
-        Parsed ping control messages. They are instances of
+        Parsed ping control message awaiting its reply. Instance of
         :class:`ws4py.messaging.PingControlMessage`
         """
 
-        self.pongs = []
+        self.pong_message = None
         """
-        Parsed pong control messages. They are instances of
+        Parsed pong control message. Instance of
         :class:`ws4py.messaging.PongControlMessage`
         """
 
@@ -67,19 +132,36 @@ class Stream(object):
         :class:`ws4py.messaging.CloseControlMessage`
         """
 
-        self.errors = []
+        self.error = None
         """
-        Detected errors while parsing. Instances of
+        Detected error while parsing. Instance of
         :class:`ws4py.messaging.CloseControlMessage`
         """
 
         self._parser = None
         """
-        Parser in charge to process bytes it is fed with.
+        Generator-based compatibility wrapper around :meth:`feed`.
+        """
+
+        self._state = READ_HEADER
+        self._need = 2
+        self._buffer = bytearray()
+        self._frame = None
+        self._masked = False
+        self._utf8validator = Utf8Validator()
+
+        self.max_buffer_size = DEFAULT_MAX_BUFFER_SIZE
+        """
+        Once the parser's accumulator has been drained, its
+        backing storage is released whenever a large message
+        grew it beyond this many bytes, so that a one-off
+        spike doesn't pin peak memory for the lifetime of
+        the connection.
         """
 
         self.always_mask = always_mask
         self.expect_masking = expect_masking
+        self.max_frame_size = max_frame_size
 
     @property
     def parser(self):
@@ -98,9 +180,12 @@ class Stream(object):
             if not self._parser.gi_running:
                 self._parser.close()
             self._parser = None
-        self.errors = None
-        self.pings = None
-        self.pongs = None
+        self._buffer = None
+        self._frame = None
+        self._utf8validator = None
+        self.error = None
+        self.ping_message = None
+        self.pong_message = None
         self.closing = None
 
     def text_message(self, text):
@@ -121,6 +206,16 @@ class Stream(object):
         """
         return BinaryMessage(bytes)
 
+    @property
+    def buffered(self):
+        """
+        Number of received bytes the parser holds which
+        have not been interpreted yet.
+        """
+        if self._buffer is None:
+            return 0
+        return len(self._buffer)
+
     @property
     def has_message(self):
         """
@@ -137,183 +232,373 @@ class Stream(object):
         Returns a close control message built from
         a :class:`ws4py.messaging.CloseControlMessage` instance,
         using the given status ``code`` and ``reason`` message.
+
+        Messages for the common status codes without a reason
+        are shared, pre-built instances.
         """
+        if not reason and code in _common_close_messages:
+            return _common_close_messages[code]
         return CloseControlMessage(code=code, reason=reason)
 
     def ping(self, data=''):
         """
         Returns a ping control message built from
         a :class:`ws4py.messaging.PingControlMessage` instance.
+
+        The empty unmasked ping frame is cached.
         """
+        if not data and not self.always_mask:
+            return _EMPTY_PING
         return PingControlMessage(data).single(mask=self.always_mask)
 
     def pong(self, data=''):
         """
         Returns a ping control message built from
         a :class:`ws4py.messaging.PongControlMessage` instance.
+
+        The empty unmasked pong frame is cached.
         """
+        if not data and not self.always_mask:
+            return _EMPTY_PONG
         return PongControlMessage(data).single(mask=self.always_mask)
 
     def receiver(self):
         """
-        Parser that keeps trying to interpret bytes it is fed with as
-        incoming frames part of a message.
+        Generator kept for compatibility with callers driving
+        the stream through ``stream.parser.send(bytes)``.
 
-        Control message are single frames only while data messages, like text
-        and binary, may be fragmented accross frames.
+        It simply hands the bytes it is sent over to :meth:`feed`
+        and yields back how many more bytes the parser requires.
+        """
+        next_size = self._need
+        try:
+            while True:
+                some_bytes = (yield next_size)
+                next_size = self.feed(some_bytes)
+        except GeneratorExit:
+            self._cleanup()
+
+    def feed(self, data):
+        """
+        Feeds the parser with more bytes and runs the frame state
+        machine as far as those bytes allow. Bytes which cannot be
+        interpreted yet are buffered until the next call.
 
-        The way it works is by instanciating a :class:`wspy.framing.Frame` object,
-        then running its parser generator which yields how much bytes
-        it requires to performs its task. The stream parser yields this value
-        to its caller and feeds the frame parser.
+        Control message are single frames only while data messages,
+        like text and binary, may be fragmented accross frames.
 
-        When the frame parser raises :exc:`StopIteration`, the stream parser
-        tries to make sense of the parsed frame. It dispatches the frame's bytes
-        to the most appropriate message type based on the frame's opcode.
+        Whenever a frame is completely parsed, it is dispatched to
+        the most appropriate message type based on the frame's opcode.
 
-        Overall this makes the stream parser totally agonstic to
-        the data provider.
+        Returns the number of bytes the parser requires before it
+        can make further progress, making the stream parser totally
+        agnostic to the data provider.
         """
-        utf8validator = Utf8Validator()
-        running = True
-        frame = None
-        while running:
-            frame = Frame()
-            while 1:
-                try:
-                    some_bytes = (yield next(frame.parser))
-                    frame.parser.send(some_bytes)
-                except GeneratorExit:
-                    running = False
+        buf = self._buffer
+        if data:
+            buf += data
+
+        # the parser state lives in locals for the duration of the
+        # loop so that attribute loads are paid once per call rather
+        # than once per state transition
+        state = self._state
+        need = self._need
+        frame = self._frame
+        masked = self._masked
+        max_size = self.max_frame_size
+
+        while len(buf) >= need:
+            if state == READ_HEADER:
+                first_byte = buf[0]
+                second_byte = buf[1]
+                del buf[:2]
+
+                frame = _pooled_frame()
+                # frame-fin = %x0 ; more frames of this message follow
+                #           / %x1 ; final frame of this message
+                frame.fin = (first_byte >> 7) & 1
+                frame.rsv1 = (first_byte >> 6) & 1
+                frame.rsv2 = (first_byte >> 5) & 1
+                frame.rsv3 = (first_byte >> 4) & 1
+                frame.opcode = first_byte & 0xf
+
+                # frame-rsv1 = %x0 ; 1 bit, MUST be 0 unless negotiated otherwise
+                # frame-rsv2 = %x0 ; 1 bit, MUST be 0 unless negotiated otherwise
+                # frame-rsv3 = %x0 ; 1 bit, MUST be 0 unless negotiated otherwise
+                if frame.rsv1 or frame.rsv2 or frame.rsv3:
+                    self._frame = frame
+                    self._parse_error(CloseControlMessage(code=1002))
+                    state, need, frame = READ_HEADER, 2, None
                     break
-                except StopIteration:
-                    frame._cleanup()
-                    some_bytes = frame.body
-
-                    # Let's avoid unmasking when there is no payload
-                    if some_bytes:
-                        if frame.masking_key and self.expect_masking:
-                            some_bytes = frame.unmask(some_bytes)
-                        elif not frame.masking_key and self.expect_masking:
-                            msg = CloseControlMessage(code=1002, reason='Missing masking when expected')
-                            self.errors.append(msg)
-                            break
-                        elif frame.masking_key and not self.expect_masking:
-                            msg = CloseControlMessage(code=1002, reason='Masked when not expected')
-                            self.errors.append(msg)
-                            break
-                        else:
-                            # If we reach this stage, it's because
-                            # the frame wasn't masked and we didn't expect
-                            # it anyway. Therefore, on py2k, the bytes
-                            # are actually a str object and can't be used
-                            # in the utf8 validator as we need integers
-                            # when we get each byte one by one.
-                            # Our only solution here is to convert our
-                            # string to a bytearray.
-                            some_bytes = bytearray(some_bytes)
-
-                    if frame.opcode == OPCODE_TEXT:
-                        if self.message and not self.message.completed:
-                            # We got a text frame before we completed the previous one
-                            msg = CloseControlMessage(code=1002, reason='Received a new message before completing previous')
-                            self.errors.append(msg)
-                            break
-
-                        m = TextMessage(some_bytes)
-                        m.completed = (frame.fin == 1)
-                        self.message = m
-
-                        if some_bytes:
-                            is_valid, end_on_code_point, _, _ = utf8validator.validate(some_bytes)
-
-                            if not is_valid or (m.completed and not end_on_code_point):
-                                self.errors.append(CloseControlMessage(code=1007, reason='Invalid UTF-8 bytes'))
-                                break
-
-                    elif frame.opcode == OPCODE_BINARY:
-                        if self.message and not self.message.completed:
-                            # We got a text frame before we completed the previous one
-                            msg = CloseControlMessage(code=1002, reason='Received a new message before completing previous')
-                            self.errors.append(msg)
-                            break
-
-                        m = BinaryMessage(some_bytes)
-                        m.completed = (frame.fin == 1)
-                        self.message = m
-
-                    elif frame.opcode == OPCODE_CONTINUATION:
-                        m = self.message
-                        if m is None:
-                            self.errors.append(CloseControlMessage(code=1002, reason='Message not started yet'))
-                            break
-
-                        m.extend(some_bytes)
-                        m.completed = (frame.fin == 1)
-                        if m.opcode == OPCODE_TEXT:
-                            if some_bytes:
-                                is_valid, end_on_code_point, _, _ = utf8validator.validate(some_bytes)
-
-                                if not is_valid or (m.completed and not end_on_code_point):
-                                    self.errors.append(CloseControlMessage(code=1007, reason='Invalid UTF-8 bytes'))
-                                    break
-
-                    elif frame.opcode == OPCODE_CLOSE:
-                        code = 1005
-                        reason = ""
-                        if frame.payload_length == 0:
-                            self.closing = CloseControlMessage(code=1005)
-                        elif frame.payload_length == 1:
-                            self.closing = CloseControlMessage(code=1005, reason='Payload has invalid length')
-                        else:
-                            try:
-                                # at this stage, some_bytes have been unmasked
-                                # so actually are held in a bytearray
-                                code = int(unpack("!H", bytes(some_bytes[0:2]))[0])
-                            except struct.error:
-                                reason = 'Failed at decoding closing code'
-                            else:
-                                # Those codes are reserved or plainly forbidden
-                                if code not in VALID_CLOSING_CODES and not (2999 < code < 5000):
-                                    reason = 'Invalid Closing Frame Code: %d' % code
-                                    code = 1005
-                                elif frame.payload_length > 1:
-                                    reason = some_bytes[2:] if frame.masking_key else frame.body[2:]
-
-                                    if not py3k: reason = bytearray(reason)
-                                    is_valid, end_on_code_point, _, _ = utf8validator.validate(reason)
-                                    if not is_valid or not end_on_code_point:
-                                        self.errors.append(CloseControlMessage(code=1007, reason='Invalid UTF-8 bytes'))
-                                        break
-                                    reason = bytes(reason)
-                            self.closing = CloseControlMessage(code=code, reason=reason)
-
-                    elif frame.opcode == OPCODE_PING:
-                        self.pings.append(PingControlMessage(some_bytes))
-
-                    elif frame.opcode == OPCODE_PONG:
-                        self.pongs.append(PongControlMessage(some_bytes))
 
+                # control frames between 3 and 7 as well as above 0xA are currently reserved
+                if 2 < frame.opcode < 8 or frame.opcode > 0xA:
+                    self._frame = frame
+                    self._parse_error(CloseControlMessage(code=1002))
+                    state, need, frame = READ_HEADER, 2, None
+                    break
+
+                # control frames cannot be fragmented
+                if frame.opcode > 0x7 and frame.fin == 0:
+                    self._frame = frame
+                    self._parse_error(CloseControlMessage(code=1002))
+                    state, need, frame = READ_HEADER, 2, None
+                    break
+
+                masked = (second_byte >> 7) & 1
+                frame.payload_length = second_byte & 0x7f
+
+                # All control frames MUST have a payload length of 125 bytes or less
+                if frame.opcode > 0x7 and frame.payload_length > 125:
+                    self._frame = frame
+                    self._parse_error(CloseControlMessage(code=1002, reason='Frame was too large'))
+                    state, need, frame = READ_HEADER, 2, None
+                    break
+
+                if frame.payload_length > 125:
+                    # frames advertising an extended length can be
+                    # rejected outright when the limit fits the
+                    # 7-bit length field, skipping the extended
+                    # length states altogether
+                    if max_size is not None and max_size <= 125:
+                        self._frame = frame
+                        self._parse_error(CloseControlMessage(code=1009, reason='Frame exceeded maximum allowed size'))
+                        state, need, frame = READ_HEADER, 2, None
+                        break
+                    if frame.payload_length == 126:
+                        state = READ_LEN16
+                        need = 2
                     else:
-                        self.errors.append(CloseControlMessage(code=1003))
+                        state = READ_LEN64
+                        need = 8
+                elif max_size is not None and frame.payload_length > max_size:
+                    self._frame = frame
+                    self._parse_error(CloseControlMessage(code=1009, reason='Frame exceeded maximum allowed size'))
+                    state, need, frame = READ_HEADER, 2, None
+                    break
+                elif masked:
+                    state = READ_MASK
+                    need = 4
+                else:
+                    state = READ_BODY
+                    need = frame.payload_length
+
+            elif state == READ_LEN16:
+                frame.payload_length = _UNPACK_U16_FROM(buf)[0]
+                del buf[:2]
+
+                if max_size is not None and frame.payload_length > max_size:
+                    self._frame = frame
+                    self._parse_error(CloseControlMessage(code=1009, reason='Frame exceeded maximum allowed size'))
+                    state, need, frame = READ_HEADER, 2, None
+                    break
 
+                if masked:
+                    state = READ_MASK
+                    need = 4
+                else:
+                    state = READ_BODY
+                    need = frame.payload_length
+
+            elif state == READ_LEN64:
+                frame.payload_length = _UNPACK_U64_FROM(buf)[0]
+                del buf[:8]
+
+                if frame.payload_length > 0x7FFFFFFFFFFFFFFF:
+                    self._frame = frame
+                    self._parse_error(CloseControlMessage(code=1002, reason='Frame was too large'))
+                    state, need, frame = READ_HEADER, 2, None
                     break
 
-                except ProtocolException:
-                    self.errors.append(CloseControlMessage(code=1002))
+                if max_size is not None and frame.payload_length > max_size:
+                    self._frame = frame
+                    self._parse_error(CloseControlMessage(code=1009, reason='Frame exceeded maximum allowed size'))
+                    state, need, frame = READ_HEADER, 2, None
                     break
-                except FrameTooLargeException:
-                    self.errors.append(CloseControlMessage(code=1002, reason="Frame was too large"))
+
+                if masked:
+                    state = READ_MASK
+                    need = 4
+                else:
+                    state = READ_BODY
+                    need = frame.payload_length
+
+            elif state == READ_MASK:
+                frame.masking_key = bytes(buf[:4])
+                del buf[:4]
+                state = READ_BODY
+                need = frame.payload_length
+
+            elif state == READ_BODY:
+                length = frame.payload_length
+                if length:
+                    frame.body = bytes(buf[:length])
+                    del buf[:length]
+                else:
+                    # empty control frames dominate ping/pong heavy
+                    # traffic; don't slice the buffer for nothing
+                    frame.body = b''
+
+                state = READ_HEADER
+                need = 2
+                self._frame = None
+
+                keep_going = self._frame_received(frame)
+                _recycle_frame(frame)
+                frame = None
+                if not keep_going:
                     break
 
-            frame._cleanup()
-            frame.body = None
-            frame = None
+        self._state = state
+        self._need = need
+        self._frame = frame
+        self._masked = masked
+
+        # a large message may have ballooned the accumulator;
+        # once it is drained, hand the memory it pinned back
+        if not buf and sys.getsizeof(buf) > self.max_buffer_size:
+            buf = self._buffer = bytearray()
 
-            if self.message is not None and self.message.completed:
-                utf8validator.reset()
+        missing = self._need - len(buf)
+        return missing if missing > 0 else 1
 
-        utf8validator.reset()
-        utf8validator = None
+    def _parse_error(self, message):
+        """
+        Records a fatal parsing error and resets the state
+        machine, dropping any buffered bytes.
+        """
+        self.error = message
+        del self._buffer[:]
+        if self._frame is not None:
+            _recycle_frame(self._frame)
+            self._frame = None
+        self._state = READ_HEADER
+        self._need = 2
+
+    def _frame_received(self, frame):
+        """
+        Dispatches a completely parsed ``frame`` to the most
+        appropriate message type based on the frame's opcode.
 
-        self._cleanup()
+        Returns ``False`` whenever parsing should pause until
+        the stream owner has handled the stream's new state.
+        """
+        some_bytes = frame.body
+        utf8validator = self._utf8validator
+
+        # Let's avoid unmasking when there is no payload
+        if some_bytes:
+            if frame.masking_key and self.expect_masking:
+                some_bytes = frame.unmask(some_bytes)
+            elif not frame.masking_key and self.expect_masking:
+                self._parse_error(CloseControlMessage(code=1002, reason='Missing masking when expected'))
+                return False
+            elif frame.masking_key and not self.expect_masking:
+                self._parse_error(CloseControlMessage(code=1002, reason='Masked when not expected'))
+                return False
+            elif not py3k:
+                # If we reach this stage, it's because
+                # the frame wasn't masked and we didn't expect
+                # it anyway. On py2k, the bytes are actually
+                # a str object and can't be used in the utf8
+                # validator as we need integers when we get
+                # each byte one by one. Our only solution here
+                # is to convert our string to a bytearray.
+                # On py3k the validator takes bytes as-is, so
+                # no copy is needed.
+                some_bytes = bytearray(some_bytes)
+
+        if frame.opcode == OPCODE_TEXT:
+            if self.message and not self.message.completed:
+                # We got a text frame before we completed the previous one
+                self._parse_error(CloseControlMessage(code=1002, reason='Received a new message before completing previous'))
+                return False
+
+            m = TextMessage(some_bytes)
+            m.completed = (frame.fin == 1)
+            self.message = m
+
+            if some_bytes:
+                is_valid, end_on_code_point, _, _ = utf8validator.validate(some_bytes)
+
+                if not is_valid or (m.completed and not end_on_code_point):
+                    self._parse_error(CloseControlMessage(code=1007, reason='Invalid UTF-8 bytes'))
+                    return False
+
+        elif frame.opcode == OPCODE_BINARY:
+            if self.message and not self.message.completed:
+                # We got a binary frame before we completed the previous one
+                self._parse_error(CloseControlMessage(code=1002, reason='Received a new message before completing previous'))
+                return False
+
+            m = BinaryMessage(some_bytes)
+            m.completed = (frame.fin == 1)
+            self.message = m
+
+        elif frame.opcode == OPCODE_CONTINUATION:
+            m = self.message
+            if m is None:
+                self._parse_error(CloseControlMessage(code=1002, reason='Message not started yet'))
+                return False
+
+            m.extend(some_bytes)
+            m.completed = (frame.fin == 1)
+            if m.opcode == OPCODE_TEXT:
+                if some_bytes:
+                    is_valid, end_on_code_point, _, _ = utf8validator.validate(some_bytes)
+
+                    if not is_valid or (m.completed and not end_on_code_point):
+                        self._parse_error(CloseControlMessage(code=1007, reason='Invalid UTF-8 bytes'))
+                        return False
+
+        elif frame.opcode == OPCODE_CLOSE:
+            code = 1005
+            reason = ""
+            if frame.payload_length == 0:
+                self.closing = CloseControlMessage(code=1005)
+            elif frame.payload_length == 1:
+                self.closing = CloseControlMessage(code=1005, reason='Payload has invalid length')
+            else:
+                try:
+                    # at this stage, some_bytes have been unmasked
+                    # and may be held in bytes or a bytearray
+                    code = int(_UNPACK_U16(bytes(some_bytes[0:2]))[0])
+                except struct.error:
+                    reason = 'Failed at decoding closing code'
+                else:
+                    # Those codes are reserved or plainly forbidden
+                    if code not in VALID_CLOSING_CODES and not (2999 < code < 5000):
+                        reason = 'Invalid Closing Frame Code: %d' % code
+                        code = 1005
+                    elif frame.payload_length > 1:
+                        reason = some_bytes[2:] if frame.masking_key else frame.body[2:]
+
+                        if not py3k: reason = bytearray(reason)
+                        is_valid, end_on_code_point, _, _ = utf8validator.validate(reason)
+                        if not is_valid or not end_on_code_point:
+                            self._parse_error(CloseControlMessage(code=1007, reason='Invalid UTF-8 bytes'))
+                            return False
+                        reason = bytes(reason)
+                self.closing = CloseControlMessage(code=code, reason=reason)
+            return False
+
+        elif frame.opcode == OPCODE_PING:
+            # single slot only; pause so a burst of pings
+            # cannot overwrite one another before the stream
+            # owner replied
+            self.ping_message = PingControlMessage(some_bytes)
+            return False
+
+        elif frame.opcode == OPCODE_PONG:
+            self.pong_message = PongControlMessage(some_bytes)
+            return False
+
+        else:
+            self._parse_error(CloseControlMessage(code=1003))
+            return False
+
+        if self.message is not None and self.message.completed:
+            utf8validator.reset()
+            return False
+
+        return True
@@ -4,7 +4,6 @@ import socket
 import ssl
 import time
 import threading
-import types
 import errno
 
 try:
@@ -15,6 +14,8 @@ except ImportError:
 
 from ws4py import WS_KEY, WS_VERSION
 from ws4py.exc import HandshakeError, StreamClosed
+from ws4py.framing import build_header, OPCODE_CONTINUATION, \
+    OPCODE_TEXT, OPCODE_BINARY
 from ws4py.streaming import Stream
 from ws4py.messaging import Message, PingControlMessage,\
     PongControlMessage
@@ -22,6 +23,10 @@ from ws4py.compat import basestring, unicode
 
 DEFAULT_READING_SIZE = 2
 
+RECV_BUFFER_SIZE = 65536
+
+_NORMAL_DISCONNECT_ERRORS = (errno.ECONNRESET, errno.EPIPE, errno.ESHUTDOWN)
+
 logger = logging.getLogger('ws4py')
 
 __all__ = ['WebSocket', 'EchoWebSocket', 'Heartbeat']
@@ -71,7 +76,26 @@ class Heartbeat(threading.Thread):
 class WebSocket(object):
     """ Represents a websocket endpoint and provides a high level interface to drive the endpoint. """
 
-    def __init__(self, sock, protocols=None, extensions=None, environ=None, heartbeat_freq=None):
+    TCP_NODELAY = True
+    """
+    Disables Nagle's algorithm by default so that small
+    frames aren't held back waiting for a full segment.
+    """
+
+    DEFAULT_RCVBUF = None
+    """
+    When set, requested kernel receive buffer size in bytes
+    (SO_RCVBUF). ``None`` leaves the kernel default.
+    """
+
+    DEFAULT_SNDBUF = None
+    """
+    When set, requested kernel send buffer size in bytes
+    (SO_SNDBUF). ``None`` leaves the kernel default.
+    """
+
+    def __init__(self, sock, protocols=None, extensions=None, environ=None,
+                 heartbeat_freq=None, socket_options=None):
         """ The ``sock`` is an opened connection
         resulting from the websocket handshake.
 
@@ -80,6 +104,10 @@ class WebSocket(object):
 
         If ``environ`` is provided, it is a copy of the WSGI environ
         dictionnary from the underlying WSGI server.
+
+        If ``socket_options`` is provided, it is a list of
+        ``(level, option, value)`` tuples applied to the underlying
+        socket on top of the class-level tuning attributes.
         """
 
         self.stream = Stream(always_mask=False)
@@ -139,11 +167,51 @@ class WebSocket(object):
         Set this to `0` or `None` to disable it entirely.
         """
         "Internal buffer to get around SSL problems"
-        self.buf = b''
+        self.buf = bytearray()
+
+        self._recv_buf = bytearray(RECV_BUFFER_SIZE)
+        """
+        Receive buffer rented once per websocket so that
+        reading from the connection doesn't allocate a new
+        bytes object per call.
+        """
+        self._recv_mv = memoryview(self._recv_buf)
 
         self._local_address = None
         self._peer_address = None
 
+        self.socket_options = socket_options
+        """
+        Additional ``(level, option, value)`` tuples applied
+        to the underlying socket.
+        """
+        self._apply_socket_options()
+
+    def _apply_socket_options(self):
+        """
+        Tunes the underlying connection: TCP_NODELAY avoids
+        Nagle-induced latency on small frames and larger kernel
+        buffers mean fewer stalls on bursty traffic.
+
+        Options the socket doesn't support are silently
+        skipped (e.g. on unix domain sockets).
+        """
+        options = []
+        if self.TCP_NODELAY:
+            options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
+        if self.DEFAULT_RCVBUF:
+            options.append((socket.SOL_SOCKET, socket.SO_RCVBUF, self.DEFAULT_RCVBUF))
+        if self.DEFAULT_SNDBUF:
+            options.append((socket.SOL_SOCKET, socket.SO_SNDBUF, self.DEFAULT_SNDBUF))
+        if self.socket_options:
+            options.extend(self.socket_options)
+
+        for level, option, value in options:
+            try:
+                self.sock.setsockopt(level, option, value)
+            except (socket.error, OSError, AttributeError):
+                pass
+
     @property
     def local_address(self):
         """
@@ -267,9 +335,17 @@ class WebSocket(object):
         or `send`.
 
         The default behaviour of this handler is to log
-        the error with a message.
-        """
-        logger.exception("Failed to receive data")
+        the error with a message. Ordinary peer disconnects
+        are logged without rendering a traceback, which is
+        expensive and only formatted when debug logging is
+        enabled.
+        """
+        if getattr(error, 'errno', None) in _NORMAL_DISCONNECT_ERRORS:
+            logger.debug("Peer went away: %s", error)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.exception("Failed to receive data")
+        else:
+            logger.error("Failed to receive data: %s", error)
 
     def _write(self, b):
         """
@@ -284,21 +360,64 @@ class WebSocket(object):
 
         self.sock.sendall(b)
 
+    def _write_gather(self, chunks):
+        """
+        Writes the given list of byte chunks, using a single
+        scatter-gather syscall when the underlying socket
+        supports it instead of copying them into one buffer.
+        """
+        if self.terminated or self.sock is None:
+            raise RuntimeError("Cannot send on a terminated websocket")
+
+        sendmsg = getattr(self.sock, 'sendmsg', None)
+        if sendmsg is not None and not self._is_secure:
+            total = 0
+            for chunk in chunks:
+                total += len(chunk)
+            try:
+                sent = sendmsg(chunks)
+                if sent < total:
+                    # partial gathered write, flush the remainder
+                    self.sock.sendall(b''.join(chunks)[sent:])
+                return
+            except (NotImplementedError, TypeError):
+                # socket objects that only mimic the interface
+                pass
+
+        self.sock.sendall(b''.join(chunks))
+
+    def _cork(self, enabled):
+        """
+        Enables or disables output batching on the underlying
+        socket, using TCP_CORK (Linux) or TCP_NOPUSH (BSD) when
+        the platform provides it, so that a burst of fragment
+        writes leaves the host as fewer packets.
+        """
+        flag = getattr(socket, 'TCP_CORK', getattr(socket, 'TCP_NOPUSH', None))
+        if flag is None or self.sock is None:
+            return
+        try:
+            self.sock.setsockopt(socket.IPPROTO_TCP, flag, 1 if enabled else 0)
+        except (socket.error, OSError, AttributeError):
+            # not a TCP socket, or it has already gone away
+            pass
+
     def send(self, payload, binary=False):
         """
         Sends the given ``payload`` out.
 
-        If ``payload`` is some bytes or a bytearray,
-        then it is sent as a single message not fragmented.
+        If ``payload`` is some bytes, a bytearray or a
+        memoryview, then it is sent as a single message
+        not fragmented.
 
-        If ``payload`` is a generator, each chunk is sent as part of
-        fragmented message.
+        If ``payload`` is any other iterable, a generator for
+        instance, each chunk is sent as part of a fragmented message.
 
         If ``binary`` is set, handles the payload as a binary message.
         """
         message_sender = self.stream.binary_message if binary else self.stream.text_message
 
-        if isinstance(payload, basestring) or isinstance(payload, bytearray):
+        if isinstance(payload, (basestring, bytearray, memoryview)):
             m = message_sender(payload).single(mask=self.stream.always_mask)
             self._write(m)
 
@@ -306,18 +425,52 @@ class WebSocket(object):
             data = payload.single(mask=self.stream.always_mask)
             self._write(data)
 
-        elif type(payload) == types.GeneratorType:
-            bytes = next(payload)
-            first = True
-            for chunk in payload:
-                self._write(message_sender(bytes).fragment(first=first, mask=self.stream.always_mask))
-                bytes = chunk
-                first = False
+        else:
+            # any other iterable is sent as a fragmented message
+            try:
+                chunks = iter(payload)
+            except TypeError:
+                raise ValueError("Unsupported type '%s' passed to send()" % type(payload))
+
+            try:
+                data = next(chunks)
+            except StopIteration:
+                return
+
+            self._cork(True)
+            try:
+                first = True
+                for chunk in chunks:
+                    self._write_fragment(data, binary, first=first, last=False)
+                    data = chunk
+                    first = False
+
+                self._write_fragment(data, binary, first=first, last=True)
+            finally:
+                self._cork(False)
+
+    def _write_fragment(self, data, binary, first, last):
+        """
+        Writes ``data`` out as one frame of a fragmented message.
+
+        When masking isn't required, the frame header is built
+        straight around the chunk, skipping the message object
+        a regular ``fragment()`` build would allocate per chunk.
+        """
+        if self.stream.always_mask:
+            message_sender = self.stream.binary_message if binary else self.stream.text_message
+            self._write(message_sender(data).fragment(first=first, last=last, mask=True))
+            return
 
-            self._write(message_sender(bytes).fragment(first=first, last=True, mask=self.stream.always_mask))
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
 
+        if first:
+            opcode = OPCODE_BINARY if binary else OPCODE_TEXT
         else:
-            raise ValueError("Unsupported type '%s' passed to send()" % type(payload))
+            opcode = OPCODE_CONTINUATION
+        header = build_header(opcode, len(data), fin=1 if last else 0)
+        self._write_gather([header, data])
 
     def _get_from_pending(self):
         """
@@ -391,7 +544,13 @@ class WebSocket(object):
             if self._is_secure:
                 b = self._get_from_pending()
             if not b and not self.buf:
-                b = self.sock.recv(self.reading_buffer_size)
+                # read speculatively into the whole rented buffer;
+                # the stream parser buffers whatever exceeds the
+                # current frame so a single syscall may serve
+                # several frames
+                n = self.sock.recv_into(self._recv_mv)
+                if n:
+                    b = self._recv_mv[:n]
             if not b and not self.buf:
                 return False
             self.buf += b
@@ -405,11 +564,9 @@ class WebSocket(object):
             # process as much as we can
             # the process will stop either if there is no buffer left
             # or if the stream is closed
-            # only pass the requested number of bytes, leave the rest in the buffer
-            requested = self.reading_buffer_size
-            if not self.process(self.buf[:requested]):
+            if not self.process(self.buf):
                 return False
-            self.buf = self.buf[requested:]
+            del self.buf[:]
 
         return True
 
@@ -459,39 +616,53 @@ class WebSocket(object):
         if not bytes and self.reading_buffer_size > 0:
             return False
 
-        self.reading_buffer_size = s.parser.send(bytes) or DEFAULT_READING_SIZE
+        self.reading_buffer_size = s.feed(bytes) or DEFAULT_READING_SIZE
 
-        if s.closing is not None:
-            logger.debug("Closing message received (%d) '%s'" % (s.closing.code, s.closing.reason))
-            if not self.server_terminated:
-                self.close(s.closing.code, s.closing.reason)
-            else:
-                self.client_terminated = True
-            return False
+        pongs = []
+
+        while True:
+            if s.closing is not None:
+                logger.debug("Closing message received (%d) '%s'", s.closing.code, s.closing.reason)
+                if not self.server_terminated:
+                    self.close(s.closing.code, s.closing.reason)
+                else:
+                    self.client_terminated = True
+                return False
 
-        if s.errors:
-            for error in s.errors:
-                logger.debug("Error message received (%d) '%s'" % (error.code, error.reason))
+            if s.error is not None:
+                error, s.error = s.error, None
+                logger.debug("Error message received (%d) '%s'", error.code, error.reason)
                 self.close(error.code, error.reason)
-            s.errors = []
-            return False
+                return False
 
-        if s.has_message:
-            self.received_message(s.message)
-            if s.message is not None:
-                s.message.data = None
-                s.message = None
-            return True
+            handled = False
+            if s.has_message:
+                self.received_message(s.message)
+                if s.message is not None:
+                    s.message.data = None
+                    s.message = None
+                handled = True
+
+            elif s.ping_message is not None:
+                pongs.append(s.pong(s.ping_message.data))
+                s.ping_message = None
+                handled = True
+
+            elif s.pong_message is not None:
+                pong, s.pong_message = s.pong_message, None
+                self.ponged(pong)
+                handled = True
 
-        if s.pings:
-            for ping in s.pings:
-                self._write(s.pong(ping.data))
-            s.pings = []
+            # bytes read speculatively may hold further frames;
+            # drain them before reading from the connection again
+            if handled and s.buffered:
+                self.reading_buffer_size = s.feed(b'') or DEFAULT_READING_SIZE
+                continue
+            break
 
-        if s.pongs:
-            for pong in s.pongs:
-                self.ponged(pong)
-            s.pongs = []
+        if pongs:
+            # answer every pending ping with a single write
+            self._write(b''.join(pongs))
 
         return True
 
@@ -535,5 +706,15 @@ class EchoWebSocket(WebSocket):
         """
         Automatically sends back the provided ``message`` to
         its originating endpoint.
+
+        The inbound payload bytes are reused as-is behind a
+        freshly built header, avoiding the intermediate message
+        object and payload copy a regular ``send()`` incurs.
         """
-        self.send(message.data, message.is_binary)
+        if self.stream.always_mask:
+            # masking rewrites the payload, no zero-copy path there
+            self.send(message.data, message.is_binary)
+            return
+
+        header = build_header(message.opcode, len(message.data), fin=1)
+        self._write_gather([header, message.data])